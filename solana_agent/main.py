@@ -72,6 +72,10 @@ async def lifespan(app: FastAPI):
             # asyncio.create_task(x_bot.run())
             ###
 
+            # Both are idempotent: the migration is marker-guarded and
+            # create_index is a no-op once the indexes exist.
+            solana_actions.migrate_token_full_data()
+            solana_actions.ensure_token_indexes()
             fetch_and_store_tokens()
 
             print("Starting broker & scheduler...")
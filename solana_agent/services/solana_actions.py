@@ -1,13 +1,69 @@
 import json
+import logging
+import re
 import requests
 from solana_agent.config import config
-from pymongo import MongoClient, UpdateOne
+from pymongo import ASCENDING, DESCENDING, MongoClient, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Fields needed to send or swap a token.
+TOKEN_INFO_PROJECTION = {"_id": 0, "address": 1, "name": 1, "symbol": 1, "decimals": 1}
+
+FULL_DATA_MIGRATION_ID = "tokens_full_data_bson"
+
 
 class SolanaActions:
     def __init__(self):
         client = MongoClient(config.MONGO_URL)
         self._db = client[config.MONGO_DB]
 
+    def ensure_token_indexes(self):
+        # create_index is a no-op once the index exists, so this is safe on every boot.
+        self._db.tokens.create_index([("symbol_normalized", ASCENDING)])
+        try:
+            self._db.tokens.create_index([("address", ASCENDING)], unique=True)
+        except DuplicateKeyError as e:
+            # Concurrent upserts may have left duplicate addresses behind; don't block startup.
+            logger.error(f"Could not create unique index on tokens.address: {e}")
+
+    def migrate_token_full_data(self):
+        # One-off: convert legacy json.dumps(full_data) strings to sub-documents.
+        # A marker in the migrations collection avoids rescanning tokens on every boot.
+        if self._db.migrations.find_one({"_id": FULL_DATA_MIGRATION_ID}):
+            return
+
+        operations = []
+        for doc in self._db.tokens.find(
+            {"full_data": {"$type": "string"}}, {"_id": 1, "symbol": 1, "full_data": 1}
+        ):
+            try:
+                full_data = json.loads(doc["full_data"])
+            except ValueError:
+                full_data = None
+            if not isinstance(full_data, dict):
+                logger.warning(f"Skipping token {doc['_id']}: full_data is not a JSON object.")
+                continue
+            operations.append(
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {
+                        "$set": {
+                            "full_data": full_data,
+                            "symbol_normalized": (doc.get("symbol") or "").lower(),
+                        }
+                    },
+                )
+            )
+
+        if operations:
+            result = self._db.tokens.bulk_write(operations, ordered=False)
+            print(f"Migrated full_data for {result.modified_count} tokens.")
+        self._db.migrations.update_one(
+            {"_id": FULL_DATA_MIGRATION_ID}, {"$set": {"done": True}}, upsert=True
+        )
+
     def store_tokens(self, tokens):
         operations = []
         for token in tokens:
@@ -17,10 +73,11 @@ class SolanaActions:
                     "$set": {
                         "name": token["name"],
                         "symbol": token["symbol"],
+                        "symbol_normalized": (token.get("symbol") or "").lower(),
                         "decimals": token["decimals"],
                         "daily_volume": token.get("daily_volume"),
                         "created_at": token.get("created_at"),
-                        "full_data": json.dumps(token),
+                        "full_data": token,
                     }
                 },
                 "upsert": True,
@@ -28,7 +85,7 @@ class SolanaActions:
             operations.append(UpdateOne(**operation))
 
         if operations:
-            result = self._db.tokens.bulk_write(operations)
+            result = self._db.tokens.bulk_write(operations, ordered=False)
             print(
                 f"Upserted {result.upserted_count} tokens, modified {result.modified_count} tokens."
             )
@@ -44,16 +101,25 @@ class SolanaActions:
             print(f"Failed to fetch tokens. Status code: {response.status_code}")
 
     def get_token_info(self, token_query):
-        query = {
-            "$or": [
-                {"symbol": {"$regex": token_query, "$options": "i"}},
-                {"address": token_query},
-            ]
-        }
+        # Exact address / normalized symbol matches are served by the indexes;
+        # ties on symbol go to the highest daily_volume. The substring regex is
+        # only a fallback when neither hits.
         token = self._db.tokens.find_one(
-            query, {"_id": 0, "address": 1, "name": 1, "symbol": 1, "decimals": 1}
+            {
+                "$or": [
+                    {"address": token_query},
+                    {"symbol_normalized": token_query.lower()},
+                ]
+            },
+            TOKEN_INFO_PROJECTION,
+            sort=[("daily_volume", DESCENDING)],
+        )
+        if token:
+            return token
+        return self._db.tokens.find_one(
+            {"symbol": {"$regex": re.escape(token_query), "$options": "i"}},
+            TOKEN_INFO_PROJECTION,
         )
-        return token
 
     def send_tokens_by_symbol(self, address: str, amount: str, token_symbol: str) -> str:
         try:
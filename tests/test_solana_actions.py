@@ -0,0 +1,91 @@
+import json
+import pytest
+from solana_agent.services.solana_actions import (
+    TOKEN_INFO_PROJECTION,
+    SolanaActions,
+)
+
+
+@pytest.fixture
+def db(mocker):
+    client = mocker.patch("solana_agent.services.solana_actions.MongoClient")
+    return client.return_value.__getitem__.return_value
+
+
+@pytest.fixture
+def solana_actions(db):
+    return SolanaActions()
+
+
+def test_migrate_converts_valid_full_data_string(solana_actions, db):
+    payload = {"address": "So111", "symbol": "SOL", "tags": ["verified"]}
+    db.migrations.find_one.return_value = None
+    db.tokens.find.return_value = [
+        {"_id": 1, "symbol": "SOL", "full_data": json.dumps(payload)}
+    ]
+
+    solana_actions.migrate_token_full_data()
+
+    (operations,), _ = db.tokens.bulk_write.call_args
+    assert len(operations) == 1
+    assert operations[0]._filter == {"_id": 1}
+    assert operations[0]._doc == {
+        "$set": {"full_data": payload, "symbol_normalized": "sol"}
+    }
+    db.migrations.update_one.assert_called_once()
+
+
+@pytest.mark.parametrize("full_data", ["{not json", json.dumps(["a", "b"])])
+def test_migrate_leaves_invalid_full_data_untouched(solana_actions, db, full_data):
+    db.migrations.find_one.return_value = None
+    db.tokens.find.return_value = [{"_id": 2, "symbol": "BAD", "full_data": full_data}]
+
+    solana_actions.migrate_token_full_data()
+
+    db.tokens.bulk_write.assert_not_called()
+
+
+def test_migrate_skips_when_already_done(solana_actions, db):
+    db.migrations.find_one.return_value = {"_id": "tokens_full_data_bson"}
+
+    solana_actions.migrate_token_full_data()
+
+    db.tokens.find.assert_not_called()
+
+
+def test_store_tokens_writes_native_full_data(solana_actions, db):
+    tokens = [
+        {"address": "So111", "name": "Wrapped SOL", "symbol": "SOL", "decimals": 9},
+        {"address": "Nul111", "name": "No Symbol", "symbol": None, "decimals": 6},
+    ]
+
+    solana_actions.store_tokens(tokens)
+
+    (operations,), _ = db.tokens.bulk_write.call_args
+    first, second = (op._doc["$set"] for op in operations)
+    assert first["full_data"] == tokens[0]
+    assert first["symbol_normalized"] == "sol"
+    assert second["symbol_normalized"] == ""
+
+
+def test_get_token_info_prefers_exact_symbol(solana_actions, db):
+    sol = {"address": "So111", "name": "Wrapped SOL", "symbol": "SOL", "decimals": 9}
+    db.tokens.find_one.return_value = sol
+
+    assert solana_actions.get_token_info("sol") == sol
+
+    query, projection = db.tokens.find_one.call_args.args
+    assert query == {"$or": [{"address": "sol"}, {"symbol_normalized": "sol"}]}
+    assert projection == TOKEN_INFO_PROJECTION
+    # The substring regex (which would also match e.g. JITOSOL) is never reached.
+    assert db.tokens.find_one.call_count == 1
+
+
+def test_get_token_info_falls_back_to_escaped_regex(solana_actions, db):
+    jitosol = {"address": "J1to", "name": "Jito SOL", "symbol": "JITOSOL", "decimals": 9}
+    db.tokens.find_one.side_effect = [None, jitosol]
+
+    assert solana_actions.get_token_info("sol.") == jitosol
+
+    query, _ = db.tokens.find_one.call_args.args
+    assert query == {"symbol": {"$regex": r"sol\.", "$options": "i"}}